@@ -13,4 +13,8 @@ except Exception:
 
 
 if __name__ == "__main__":
+    # PyInstaller で固めた exe では、--jobs のワーカープロセスが main() を再実行しないようにする
+    if getattr(sys, "frozen", False):
+        import multiprocessing
+        multiprocessing.freeze_support()
     sys.exit(main())
@@ -2,9 +2,6 @@
 fixedrec - 固定長レコード変換ツール
 """
 
-from .parser import StructDef, parse_structs_config, strip_block_and_line_comments, parse_ext_list
-from .cli import main, parse_bytes_from_arg, parse_term, escape_bytes
-
 __version__ = "1.0.0"
 __all__ = [
     "StructDef",
@@ -16,3 +13,37 @@ __all__ = [
     "parse_term",
     "escape_bytes",
 ]
+
+# 公開名 → 定義モジュール。import fixedrec だけで parser/cli を読み込まないよう、
+# 初めて参照された時に import する（PEP 562）。
+# fixedrec.cli / fixedrec.parser のサブモジュール参照も従来どおり使えるようにする。
+# （python -m fixedrec とコンソールスクリプト fixedrec.cli:main はどちらも cli をすぐ import するので、
+#   速くなるのは素の import fixedrec だけ）
+_LAZY_SUBMODULES = ("cli", "parser")
+_LAZY_EXPORTS = {
+    "StructDef": "parser",
+    "parse_structs_config": "parser",
+    "strip_block_and_line_comments": "parser",
+    "parse_ext_list": "parser",
+    "main": "cli",
+    "parse_bytes_from_arg": "cli",
+    "parse_term": "cli",
+    "escape_bytes": "cli",
+}
+
+
+def __getattr__(name):
+    import importlib
+    if name in _LAZY_SUBMODULES:
+        # import_module がパッケージの属性にも登録する
+        return importlib.import_module(f".{name}", __name__)
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(_LAZY_SUBMODULES))
@@ -28,11 +28,18 @@
   python -m fixedrec.cli -i input.bin -o out.csv -c layout.struct --sep "," --escape hex --prefix %
 """
 
-import argparse
-import codecs
+# 起動時間を抑えるため、特定の経路でしか使わないモジュール（argparse, codecs, concurrent.futures,
+# shutil, tempfile, 設定キャッシュ用の json/hashlib）は使う関数の中で import する
+import binascii
+import contextlib
+import functools
+import io
+import mmap
 import os
+import re
+import struct
 import sys
-from typing import Sequence
+from typing import List, Sequence, Tuple
 
 from .parser import StructDef, parse_structs_config
 
@@ -40,11 +47,31 @@ from .parser import StructDef, parse_structs_config
 CRLF = b"\r\n"
 LF = b"\n"
 CR = b"\r"
+# --in-term/--out-term のプリセット名（小文字）→ バイト列
+TERM_PRESETS = {"crlf": CRLF, "lf": LF, "cr": CR, "none": b""}
 
+# parse_bytes_from_arg が解釈するバックスラッシュエスケープ（Python の文字列リテラルと同じ種類）
+ESCAPE_SEQ_RE = re.compile(
+    r"""\\(?:[\n\\'"abfnrtv]|[0-7]{1,3}|x[0-9A-Fa-f]{2}|u[0-9A-Fa-f]{4}|U[0-9A-Fa-f]{8}|N\{[^}]*\})"""
+)
 
+# まとめ読み/まとめ書きの単位（バイト）
+IO_CHUNK_SIZE = 1 << 20
+
+# stderr に表示する警告の既定の上限件数
+MAX_WARNINGS = 100
+
+# --jobs で並列変換する入力サイズの下限（小さい入力はプロセス起動の方が高くつく）
+PARALLEL_MIN_BYTES = 64 << 20
+
+# 設定ファイル解析結果のキャッシュ（--config-cache）に残す件数
+CONFIG_CACHE_MAX_FILES = 32
+
+
+@functools.lru_cache(maxsize=128)
 def parse_bytes_from_arg(arg: str) -> bytes:
     """
-    任意の文字列をバイト列へ。
+    任意の文字列をバイト列へ（純粋関数なので結果をキャッシュする）。
       - "hex:1f" のような16進列（偶数桁）→ bytes
       - バックスラッシュエスケープ "\\t", "\\x1f", "\\n" 等（Python互換）→ UTF-8 エンコード
       - 上記以外 → 与えられた文字列を UTF-8 エンコード
@@ -58,32 +85,50 @@ def parse_bytes_from_arg(arg: str) -> bytes:
         except ValueError:
             raise ValueError(f"hex 指定を変換できません: {arg!r}")
 
-    # バックスラッシュエスケープが含まれる場合のみ unicode_escape で処理
+    # バックスラッシュエスケープが含まれる場合のみ、認識できるエスケープ列だけを unicode_escape で処理する。
+    # それ以外（非ASCII文字や未知の "\\q" 等）は書かれたまま残すので、非ASCII文字も化けない
     if '\\' in arg:
-        try:
-            decoded = codecs.decode(arg, "unicode_escape")  # "\\t" → "\t" 等
-            return decoded.encode("utf-8")
-        except (UnicodeDecodeError, ValueError):
-            # エスケープ処理に失敗した場合は通常のUTF-8エンコード
-            pass
+        import codecs
+
+        def decode_escape(m):
+            try:
+                return codecs.decode(m.group(), "unicode_escape")  # "\\t" → "\t" 等
+            except (UnicodeDecodeError, ValueError):
+                # 変換できないエスケープ（"\\N{不明な名前}" 等）はそのまま残す
+                return m.group()
+
+        return ESCAPE_SEQ_RE.sub(decode_escape, arg).encode("utf-8")
 
     return arg.encode("utf-8")
 
 
+@functools.lru_cache(maxsize=128)
 def parse_term(term: str) -> bytes:
     """区切り種別をプリセット or 任意バイト列へ。"""
-    t = term.lower()
-    if t == "crlf":
-        return CRLF
-    if t == "lf":
-        return LF
-    if t == "cr":
-        return CR
-    if t == "none":
-        return b""
+    preset = TERM_PRESETS.get(term.lower())
+    if preset is not None:
+        return preset
     return parse_bytes_from_arg(term)
 
 
+@functools.lru_cache(maxsize=128)
+def hex_escaper(prefix: str = ""):
+    """
+    --escape hex 用の変換関数 (bytes-like → bytes) を prefix に応じて選んで返す（prefix ごとに一度だけ）。
+    整形はすべて binascii.hexlify に任せ、1 バイトずつ format はしない
+    （bytes のまま返るので、str 経由の .encode によるコピーも無い）。
+      - prefix なし   : "00 1f 2a"（スペース区切り）
+      - 1 文字(ASCII) : hexlify の区切りとして挿入し、先頭の 1 つだけ自前で付ける
+      - それ以外      : スペース区切りで整形してから置き換える（hex 文字に空白は現れない）
+    """
+    if prefix == "":
+        return lambda bs: binascii.hexlify(bs, b" ")
+    pb = prefix.encode("ascii")
+    if len(pb) == 1:
+        return lambda bs: pb + binascii.hexlify(bs, pb) if bs else b""
+    return lambda bs: (b" " + binascii.hexlify(bs, b" ")).replace(b" ", pb) if bs else b""
+
+
 def escape_bytes(bs: bytes, mode: str, prefix: str = "") -> bytes:
     """
     可視化用エスケープ。
@@ -91,17 +136,14 @@ def escape_bytes(bs: bytes, mode: str, prefix: str = "") -> bytes:
       - mode="hex" : すべてのバイトを prefix+2桁HEX で表記
     """
     if mode == "none":
+        # 変換しないのでコピーもせず同じオブジェクトを返す（1 バイト単位で置換/削除するモードを
+        # 足す場合は、256 バイトの変換表を一度作って bs.translate(table, delete) で C 側に任せること）
         return bs
     if mode != "hex":
         raise ValueError(f"未知の --escape モード: {mode!r}")
     # 変更: prefix が空文字の場合はスペース区切りの 2 桁 hex（例: "00 1f 2a"）を出力
-    if prefix == "":
-        out = " ".join(f"{b:02x}" for b in bs)
-        return out.encode("ascii")
-
     # prefix が指定されている場合は従来通り連結して出力（例: "%00%1f" や "\\x00\\x1f"）
-    out_chars = [f"{prefix}{b:02x}" for b in bs]
-    return "".join(out_chars).encode("ascii")
+    return hex_escaper(prefix)(bs)
 
 
 def read_config_file(path: str) -> str:
@@ -117,6 +159,86 @@ def read_config_file(path: str) -> str:
             continue
 
 
+def config_cache_dir() -> str:
+    """設定ファイル解析結果のキャッシュ置き場（$XDG_CACHE_HOME/fixedrec、既定 ~/.cache/fixedrec）。"""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "fixedrec")
+
+
+@functools.lru_cache(maxsize=None)
+def parser_fingerprint() -> str:
+    """
+    設定キャッシュのキーに含める、解析処理の指紋（parser.py のソースの SHA-1）。
+    パーサーを直すと指紋が変わるので、古い解析結果は自然に使われなくなる。
+    ソースを読めない場合（exe 同梱など）はパッケージの版で代用する。
+    """
+    import hashlib
+    from . import __version__, parser
+
+    try:
+        with open(parser.__file__, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except (OSError, TypeError):
+        return f"version:{__version__}"
+
+
+def load_structs_cached(path: str, use_cache: bool = True) -> List[StructDef]:
+    """
+    設定ファイルを読み込んで解析し、StructDef の配列を返す。
+
+    解析結果は (絶対パス, mtime_ns, サイズ, parser_fingerprint()) をキーに、
+    ユーザーキャッシュへ JSON（[(name, fields, exts), ...]）で保存し、
+    設定ファイルもパーサーも変わっていなければ次回以降は読込・解析を省略する。
+    キャッシュは新しいものから CONFIG_CACHE_MAX_FILES 件まで残す。
+    キャッシュの読み書きに失敗した場合や中身が壊れている場合は黙って通常の解析結果を使う。
+    """
+    if not use_cache:
+        return parse_structs_config(read_config_file(path))
+
+    import hashlib
+    import json
+
+    st = os.stat(path)
+    key = repr((os.path.abspath(path), st.st_mtime_ns, st.st_size, parser_fingerprint()))
+    cache_dir = config_cache_dir()
+    cache_path = os.path.join(cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached["key"] == key:
+            structs = [StructDef(name=name, fields=[(fname, int(flen)) for fname, flen in fields],
+                                 exts=list(exts))
+                       for name, fields, exts in cached["structs"]]
+            # 最近使ったものとして残す
+            os.utime(cache_path)
+            return structs
+    except Exception:
+        pass
+
+    structs = parse_structs_config(read_config_file(path))
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"key": key,
+                       "structs": [[sd.name, sd.fields, sd.exts] for sd in structs]},
+                      f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+
+        # 古いキャッシュを間引く
+        entries = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir)
+                   if name.endswith(".json")]
+        entries.sort(key=os.path.getmtime, reverse=True)
+        for old in entries[CONFIG_CACHE_MAX_FILES:]:
+            os.remove(old)
+    except OSError:
+        pass
+
+    return structs
+
+
 def resolve_external_path(path: str) -> str:
     """外部ファイルの参照を解決するヘルパー。
 
@@ -154,9 +276,9 @@ def choose_struct(structs: Sequence[StructDef], want_name: str | None, input_pat
         raise ValueError(f"--struct '{want_name}' が見つかりません。候補: {names}")
 
     # 自動選択：入力拡張子（小文字、ドット無し）
-    base = os.path.basename(input_path)
-    _, ext = os.path.splitext(base)
-    ext = ext.lower().lstrip(".")
+    # os.path.splitext と同じく、ファイル名先頭のドットは拡張子の区切りとみなさない
+    _, dot, ext = os.path.basename(input_path).lstrip(".").rpartition(".")
+    ext = ext.lower() if dot else ""
     if not ext:
         if len(structs) == 1:
             return structs[0]
@@ -179,7 +301,397 @@ def choose_struct(structs: Sequence[StructDef], want_name: str | None, input_pat
         f"拡張子 '.{ext}' に複数の struct がマッチしました: {names}。--struct で明示指定してください。")
 
 
+class RecordFormatError(ValueError):
+    """入力レコードの終端欠落/不一致（厳密チェック時）"""
+
+
+def is_passthrough(sd: StructDef, in_term_bytes: bytes, out_term_bytes: bytes,
+                   sep_bytes: bytes, escape: str = "none") -> bool:
+    """
+    変換しても入力と同じバイト列になるか（--escape none・区切りが現れない・入出力終端が同じ）。
+    区切りが現れないのはフィールドが 1 つの場合。区切りが空の場合も含めるが、CLI は空の --sep を
+    受け付けないので、これはライブラリとして直接呼ぶ場合にだけ意味を持つ。
+    """
+    return (escape == "none" and (len(sd.fields) == 1 or not sep_bytes)
+            and in_term_bytes == out_term_bytes)
+
+
+def copy_file_range_all(in_fd: int, out_fd: int, offset: int, length: int) -> None:
+    """
+    in_fd の offset から length バイトを out_fd の現在位置へカーネル内でコピーする。
+    （os.copy_file_range が無い/使えない場合は OSError を送出する）
+    """
+    if not hasattr(os, "copy_file_range"):
+        raise OSError("os.copy_file_range が使えません")
+    while length > 0:
+        copied = os.copy_file_range(in_fd, out_fd, length, offset)
+        if copied <= 0:
+            raise OSError("copy_file_range が途中で 0 バイトを返しました")
+        offset += copied
+        length -= copied
+
+
+def build_block_converter(sd: StructDef, in_term_len: int,
+                          sep_bytes: bytes, out_term_bytes: bytes,
+                          escape: str = "none", prefix: str = "",
+                          in_term_bytes: bytes | None = None):
+    """
+    連続する n レコードをまとめて変換する関数 convert(data, start, n, out) を生成して返す。
+    （入力終端の検証は呼び出し側で済ませておくこと）
+
+    sd.record_format に入力終端の読み飛ばし（"<len>x"）を足したレイアウトの iter_unpack で
+    レコードごとのフィールドタプルを得て、区切りでの結合・行末での結合までを map/join に
+    任せるので、レコード数に比例するループはすべて C 側で回る。
+
+    --escape hex の場合は先にウィンドウ全体を bytes.hex で 1 バイト = 固定幅の文字列へ
+    変換してから同じ要領で切り出す。
+      - 接頭辞なし: "41 42 43 ..." → 1 バイト 3 文字。フィールド末尾の空白は読み飛ばす
+      - 接頭辞あり: "%41%42%43..." → 1 バイト (接頭辞長 + 2) 文字
+
+    --escape none で区切りが現れない（フィールド1つ。ライブラリ呼び出しでは区切りが空の場合も）うえ、
+    入力終端(in_term_bytes)と出力終端が同じなら、出力は入力そのものなので
+    ウィンドウをそのまま 1 回コピーするだけで済ませる（1 レコードあたり memcpy 1 回）。
+    """
+    if escape == "none":
+        width, gap = 1, 0
+    elif escape == "hex":
+        width, gap = (3, 1) if prefix == "" else (len(prefix) + 2, 0)
+    else:
+        raise ValueError(f"未知の --escape モード: {escape!r}")
+
+    rec_len = sd.total_len + in_term_len
+    if in_term_bytes is not None and is_passthrough(sd, in_term_bytes, out_term_bytes,
+                                                    sep_bytes, escape):
+        def copy_through(data, start, n, out):
+            if n > 0:
+                with memoryview(data) as mv:
+                    out += mv[start:start + n * rec_len]
+
+        return copy_through
+
+    if width == 1:
+        fmt = sd.record_format
+    else:
+        fmt = "".join(f"{width * ln - gap}s{gap}x" if gap else f"{width * ln}s" for _, ln in sd.fields)
+    if in_term_len:
+        fmt += f"{width * in_term_len}x"
+    rows = struct.Struct(fmt)
+    row_join = sep_bytes.join
+
+    # --prefix は --escape hex の時だけ使う（none では非ASCIIの接頭辞が与えられていても無視する）
+    if escape != "hex":
+        to_hex = None
+    elif prefix == "":
+        # 接頭辞なしは各バイトの後ろに空白が付く形（"41 42 43 "）に揃えて固定幅で切り出す
+        def to_hex(view):
+            return binascii.hexlify(view, b" ") + b" "
+    else:
+        to_hex = hex_escaper(prefix)
+
+    def convert(data, start, n, out):
+        if n <= 0:
+            return
+        with memoryview(data) as mv:
+            window = mv[start:start + n * rec_len]
+            if to_hex is not None:
+                window = to_hex(window)
+            out += out_term_bytes.join(map(row_join, rows.iter_unpack(window)))
+        out += out_term_bytes
+
+    return convert
+
+
+def iter_input_windows(src, read_size: int, begin: int = 0, end: int | None = None):
+    """
+    入力を (data, start, stop) の組で順に返す。data[start:stop] が次に処理する範囲。
+
+    - src が read() を持つストリームなら read_size ずつ読み、読んだ bytes 全体を返す
+    - src が mmap / bytes 等のバッファなら、コピーせずに src 自身と範囲だけを返す
+      （begin/end でバッファ内の処理範囲を絞れる。ストリームでは無視）
+    """
+    if hasattr(src, "read") and not isinstance(src, mmap.mmap):
+        while True:
+            data = src.read(read_size)
+            if not data:
+                return
+            yield data, 0, len(data)
+    else:
+        size = len(src) if end is None else min(end, len(src))
+        for pos in range(begin, size, read_size):
+            yield src, pos, min(pos + read_size, size)
+
+
+def convert_records(src, wf, sd: StructDef, in_term_bytes: bytes, out_term_bytes: bytes,
+                    sep_bytes: bytes, escape: str = "none", prefix: str = "",
+                    rows_limit: int | None = None, lenient: bool = False,
+                    chunk_size: int | None = None, max_warnings: int | None = None,
+                    src_fd: int | None = None,
+                    byte_range: Tuple[int, int] | None = None) -> Tuple[int, int]:
+    """
+    固定長レコードを読み、区切りテキストへ変換して wf へ書き出す。
+
+    - src は read() を持つストリーム、または mmap / bytes 等のバッファ
+      （バッファの場合はフィールドを直接切り出すので入力全体のコピーが発生しない）
+    - 入力は chunk_size（既定 IO_CHUNK_SIZE）前後（レコード長の整数倍）ずつ処理する
+    - 出力は bytearray に溜めて chunk_size を超えたらまとめて書く
+    - 厳密モード（lenient=False）で終端の欠落/不一致を検出したら、
+      それまでの出力を書き出したうえで RecordFormatError を送出する
+    - 警告は max_warnings（既定 MAX_WARNINGS、0 なら無制限）件まで stderr に表示し、
+      それを超えた分は件数だけ数えて最後に省略件数を表示する
+    - src が src_fd のファイルを mmap したバッファで、変換しても入力と同じになる場合
+      （is_passthrough）は、検証済みの範囲を copy_file_range でカーネル内コピーする
+      （使えなければ通常のコピーに戻る）
+    - byte_range=(begin, end) を渡すとバッファのその範囲だけを変換する（begin はレコード境界）。
+      行番号は入力先頭から数える
+
+    戻り値: (出力レコード数, 警告数)
+    """
+    total_field_len = sd.total_len
+    in_term_len = len(in_term_bytes)
+    rec_len = total_field_len + in_term_len
+    chunk_size = chunk_size or IO_CHUNK_SIZE
+    read_size = max(1, chunk_size // rec_len) * rec_len
+    if max_warnings is None:
+        max_warnings = MAX_WARNINGS
+    begin, end = byte_range if byte_range is not None else (0, None)
+    row_base = begin // rec_len  # 警告/エラーに出す行番号のずれ
+
+    processed = 0
+    warnings = 0
+    messages = []  # 表示待ちの警告（ウィンドウごとにまとめて stderr へ書く）
+    out_buf = bytearray()
+    residual = b""
+    expected_rows = -1
+    expected_cols = []
+    # 終端の j バイト目として不正なバイト（期待値以外）にマッチする正規表現
+    term_mismatch_res = [re.compile(b"[^\\x%02x]" % b) for b in in_term_bytes]
+
+    # 出力はウィンドウ単位でまとめて生成する（レコード単位の連結/書込みは行わない）
+    # 終端を検証済みの範囲は、変換しても同じになるなら入力をそのままコピーする
+    passthrough = is_passthrough(sd, in_term_bytes, out_term_bytes, sep_bytes, escape)
+    convert_block = build_block_converter(sd, in_term_len, sep_bytes, out_term_bytes,
+                                          escape, prefix, in_term_bytes)
+    # lenient で不一致行を含むウィンドウは、終端を出力終端へ置き換える通常の変換を使う
+    convert_dirty = (build_block_converter(sd, in_term_len, sep_bytes, out_term_bytes, escape, prefix)
+                     if passthrough else convert_block)
+    kernel_copy = (passthrough and src_fd is not None
+                   and (isinstance(src, mmap.mmap) or not hasattr(src, "read")))
+
+    def emit(data, start, n):
+        # data[start:] から n レコードぶんを出力する
+        nonlocal kernel_copy
+        if kernel_copy and n > 0 and data is src:
+            try:
+                if out_buf:
+                    wf.write(out_buf)
+                    out_buf.clear()
+                wf.flush()
+                out_fd = wf.fileno()
+                out_pos = os.lseek(out_fd, 0, os.SEEK_CUR)
+            except (OSError, AttributeError, io.UnsupportedOperation):
+                kernel_copy = False
+            else:
+                try:
+                    copy_file_range_all(src_fd, out_fd, start, n * rec_len)
+                    return
+                except OSError:
+                    # 一度失敗したら以降は通常のコピーで出力する（途中まで書いた分は取り消す）
+                    kernel_copy = False
+                    os.lseek(out_fd, out_pos, os.SEEK_SET)
+                    os.ftruncate(out_fd, out_pos)
+        convert_block(data, start, n, out_buf)
+
+    def warn_room():
+        # あと何件の警告を表示できるか
+        return max(0, max_warnings - warnings) if max_warnings > 0 else None
+
+    def warn(msg):
+        nonlocal warnings
+        if warn_room() != 0:
+            messages.append(msg + "\n")
+        warnings += 1
+
+    def mismatch_msg(data, off, row_no):
+        tail = data[off+total_field_len:off+rec_len]
+        return (f"入力終端不一致（行 {row_no} ）: "
+                f"got={tail!r} expected={in_term_bytes!r}")
+
+    try:
+        for data, start, stop in iter_input_windows(src, read_size, begin, end):
+            if rows_limit is not None and processed >= rows_limit:
+                break
+            if residual:
+                data = residual + data[start:stop]
+                start, stop = 0, len(data)
+
+            n = (stop - start) // rec_len
+            if rows_limit is not None:
+                n = min(n, rows_limit - processed)
+            end = start + n * rec_len
+            if n != expected_rows:
+                # 終端の各バイトについて、ウィンドウ全行ぶんの期待値（行数が変わった時だけ作り直す）
+                expected_cols = [in_term_bytes[j:j+1] * n for j in range(in_term_len)]
+                expected_rows = n
+            if not all(data[start+total_field_len+j:end:rec_len] == expected_cols[j]
+                       for j in range(in_term_len)):
+                # 列ごとの一括比較で不一致があったウィンドウだけ、終端の各列から期待値と異なる
+                # バイトの位置（= 行番号）を正規表現でまとめて拾い、該当行を報告する
+                bad_rows = sorted(set().union(*(
+                    (m.start() for m in term_mismatch_res[j].finditer(
+                        data[start+total_field_len+j:end:rec_len]))
+                    for j in range(in_term_len))))
+                if not lenient:
+                    row = bad_rows[0]
+                    # 不一致行の手前までは出力しておく
+                    emit(data, start, row)
+                    processed += row
+                    raise RecordFormatError(
+                        mismatch_msg(data, start + row * rec_len, row_base + processed + 1))
+                # 続行（終端は読み飛ばすので出力は指定の out-term で正規化される）
+                # 表示上限を超えた分はメッセージを作らず件数だけ数える
+                room = warn_room()
+                for row in bad_rows[:room]:
+                    messages.append(
+                        f"[ERR] {mismatch_msg(data, start + row * rec_len, row_base + processed + row + 1)}\n")
+                warnings += len(bad_rows)
+                convert_dirty(data, start, n, out_buf)
+            else:
+                emit(data, start, n)
+            processed += n
+            residual = data[end:stop]
+
+            if messages:
+                sys.stderr.write("".join(messages))
+                messages.clear()
+            if len(out_buf) >= chunk_size:
+                wf.write(out_buf)
+                out_buf.clear()
+
+        # 末尾の端数（レコード長に満たないバイト列）
+        if residual and (rows_limit is None or processed < rows_limit):
+            if len(residual) < total_field_len:
+                warn(f"[WARN] 末尾不完全: 残り {len(residual)} バイト（期待 {total_field_len}）を破棄します。")
+            else:
+                msg = f"末尾不完全: 入力終端が読めません（行 {row_base+processed+1} 期待 {in_term_len}B）"
+                if not lenient:
+                    raise RecordFormatError(msg)
+                warn(f"[ERR] {msg}")
+                # 欠けている終端を補ってから 1 レコードとして変換
+                convert_block(residual[:total_field_len] + in_term_bytes, 0, 1, out_buf)
+                processed += 1
+    finally:
+        # 厳密モードのエラー時も、それまでに変換できた行は出力しておく
+        if out_buf:
+            wf.write(out_buf)
+        if max_warnings > 0 and warnings > max_warnings:
+            messages.append(f"[WARN] 警告が多いため {warnings - max_warnings} 件の表示を省略しました。\n")
+        if messages:
+            sys.stderr.write("".join(messages))
+
+    return processed, warnings
+
+
+def convert_part(job) -> Tuple[int, int, List[str], str | None]:
+    """
+    並列変換のワーカー。入力ファイルを mmap して byte_range の範囲を part ファイルへ変換する。
+
+    戻り値: (出力レコード数, 警告数, 表示する警告の行, 厳密モードのエラーメッセージ or None)
+    """
+    (input_path, part_path, sd, in_term_bytes, out_term_bytes, sep_bytes, escape, prefix,
+     lenient, chunk_size, max_warnings, byte_range) = job
+    err = io.StringIO()
+    processed, warnings, error = 0, 0, None
+    with open(input_path, "rb", buffering=0) as rf, \
+            mmap.mmap(rf.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+            open(part_path, "wb", buffering=max(chunk_size, io.DEFAULT_BUFFER_SIZE)) as wf, \
+            contextlib.redirect_stderr(err):
+        try:
+            processed, warnings = convert_records(
+                mm, wf, sd, in_term_bytes, out_term_bytes, sep_bytes, escape=escape, prefix=prefix,
+                lenient=lenient, chunk_size=chunk_size, max_warnings=max_warnings,
+                byte_range=byte_range)
+        except RecordFormatError as e:
+            error = str(e)
+    lines = err.getvalue().splitlines(keepends=True)
+    # 1 警告 = 1 行。上限を超えた場合の省略件数の行は呼び出し側でまとめて出すので落とす
+    return processed, warnings, (lines[:max_warnings] if max_warnings > 0 else lines), error
+
+
+def convert_records_parallel(input_path: str, output_path: str, wf, sd: StructDef,
+                             in_term_bytes: bytes, out_term_bytes: bytes, sep_bytes: bytes,
+                             escape: str = "none", prefix: str = "",
+                             rows_limit: int | None = None, lenient: bool = False,
+                             chunk_size: int | None = None, max_warnings: int | None = None,
+                             jobs: int = 2) -> Tuple[int, int]:
+    """
+    convert_records と同じ変換を、入力をレコード範囲で jobs 個に分けて複数プロセスで行う。
+
+    - 固定長なので分割点はレコード長の倍数で決まる（端数は最後の範囲が扱う）
+    - 各プロセスは出力先と同じディレクトリに作った一時ファイル（tempfile.mkstemp）へ書き、
+      ここで先頭から順に wf へ連結する（既存のファイルを上書きしないよう名前は毎回作る）
+    - 警告は範囲の順に表示し、max_warnings による上限は全体で数える
+    - 厳密モードで不一致があれば、その範囲の不一致行の手前までを出力して RecordFormatError を送出する
+
+    戻り値: (出力レコード数, 警告数)
+    """
+    import concurrent.futures
+    import shutil
+    import tempfile
+
+    rec_len = sd.total_len + len(in_term_bytes)
+    chunk_size = chunk_size or IO_CHUNK_SIZE
+    if max_warnings is None:
+        max_warnings = MAX_WARNINGS
+    total_size = os.path.getsize(input_path)
+    n_records = total_size // rec_len
+    stop = total_size
+    if rows_limit is not None and rows_limit <= n_records:
+        n_records = rows_limit
+        stop = rows_limit * rec_len
+    jobs = max(1, min(jobs, n_records))
+    bounds = [n_records * i // jobs * rec_len for i in range(jobs)] + [stop]
+    part_dir = os.path.dirname(output_path) or "."
+    part_paths: List[str] = []
+
+    processed = 0
+    warnings = 0
+    try:
+        for i in range(jobs):
+            fd, part_path = tempfile.mkstemp(prefix=os.path.basename(output_path) + ".",
+                                             suffix=f".part{i}", dir=part_dir)
+            os.close(fd)
+            part_paths.append(part_path)
+        job_args = [(input_path, part_paths[i], sd, in_term_bytes, out_term_bytes, sep_bytes,
+                     escape, prefix, lenient, chunk_size, max_warnings, (bounds[i], bounds[i + 1]))
+                    for i in range(jobs)]
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as ex:
+            # 結果は範囲の順に返るので、先に終わった範囲から順に連結していく
+            for part_path, (n, w, lines, error) in zip(part_paths, ex.map(convert_part, job_args)):
+                with open(part_path, "rb") as pf:
+                    shutil.copyfileobj(pf, wf, chunk_size)
+                if max_warnings > 0:
+                    lines = lines[:max(0, max_warnings - warnings)]
+                if lines:
+                    sys.stderr.write("".join(lines))
+                processed += n
+                warnings += w
+                if error is not None:
+                    # 後続の範囲は不要（実行中のものは with を抜ける時に終わりを待つ）
+                    ex.shutdown(cancel_futures=True)
+                    raise RecordFormatError(error)
+    finally:
+        if max_warnings > 0 and warnings > max_warnings:
+            sys.stderr.write(f"[WARN] 警告が多いため {warnings - max_warnings} 件の表示を省略しました。\n")
+        for part_path in part_paths:
+            with contextlib.suppress(OSError):
+                os.remove(part_path)
+
+    return processed, warnings
+
+
 def main():
+    import argparse
+
     ap = argparse.ArgumentParser(
         description="固定長(任意終端)→区切りテキスト変換（struct複数/拡張子対応・ブロックコメント対応）")
     ap.add_argument("-i", "--input", required=True,
@@ -208,8 +720,17 @@ def main():
 
     ap.add_argument("--max-rows", type=int, default=0,
                     help="先頭Nレコードのみ処理（0=全件）")
+    ap.add_argument("--max-warnings", type=int, default=MAX_WARNINGS,
+                    help=f"表示する警告の上限件数（超えた分は件数のみ表示, 0=無制限, 既定={MAX_WARNINGS}）")
+    ap.add_argument("--io-buffer", type=int, default=IO_CHUNK_SIZE,
+                    help=f"まとめ読み/まとめ書きの単位（バイト, 既定={IO_CHUNK_SIZE}）")
+    ap.add_argument("--jobs", type=int, default=1,
+                    help=f"並列変換のプロセス数（0=CPU 数, 既定=1）。"
+                         f"入力が {PARALLEL_MIN_BYTES >> 20} MiB 以上の場合のみ並列化する")
     ap.add_argument("--lenient", action="store_true",
                     help="入力終端の不一致/欠落時も警告して継続（既定は厳密チェックで即エラー）")
+    ap.add_argument("--config-cache", action="store_true",
+                    help="設定ファイル解析結果をキャッシュ（~/.cache/fixedrec）に保存して再利用する（既定=使わない）")
     ap.add_argument("--dump-layout", action="store_true", help="レイアウトを表示して終了")
     ap.add_argument("--summary", action="store_true", help="処理サマリのみ簡潔に表示")
     ap.add_argument("--header-structs", action="store_true",
@@ -223,8 +744,7 @@ def main():
 
     # 設定ファイル読込・解析（複数struct対応）
     try:
-        cfg_text = read_config_file(args.config)
-        structs = parse_structs_config(cfg_text)
+        structs = load_structs_cached(args.config, use_cache=args.config_cache)
     except Exception as e:
         print(f"[ERR] 設定ファイルエラー: {e}", file=sys.stderr)
         sys.exit(2)
@@ -243,7 +763,7 @@ def main():
                 f"  - {x.name}: fields={len(x.fields)}, exts={ex}", file=sys.stderr)
         sys.exit(2)
 
-    total_field_len = sum(length for _, length in sd.fields)
+    total_field_len = sd.total_len
     if total_field_len <= 0:
         print("[ERR] フィールド長合計が0です。定義を確認してください。", file=sys.stderr)
         sys.exit(2)
@@ -261,6 +781,18 @@ def main():
         print("[ERR] --sep が空です。1バイト以上にしてください。", file=sys.stderr)
         sys.exit(2)
 
+    if args.io_buffer <= 0:
+        print("[ERR] --io-buffer は 1 以上を指定してください。", file=sys.stderr)
+        sys.exit(2)
+
+    if args.max_warnings < 0:
+        print("[ERR] --max-warnings は 0 以上を指定してください。", file=sys.stderr)
+        sys.exit(2)
+
+    if args.jobs < 0:
+        print("[ERR] --jobs は 0 以上を指定してください。", file=sys.stderr)
+        sys.exit(2)
+
     in_term_len = len(in_term_bytes)
     rec_len = total_field_len + in_term_len
 
@@ -295,12 +827,28 @@ def main():
         return
 
     rows_limit = args.max_rows if args.max_rows > 0 else None
-    processed = 0
-    warnings = 0
+
+    jobs = args.jobs or os.cpu_count() or 1
+    # 並列化は処理量が十分ある場合だけ（入力そのままのコピーで済む場合は不要）
+    work_size = total_size if rows_limit is None else min(total_size, rows_limit * rec_len)
+    if work_size < PARALLEL_MIN_BYTES or is_passthrough(sd, in_term_bytes, out_term_bytes,
+                                                         sep_bytes, args.escape):
+        jobs = 1
 
     # 変換本体
     try:
-        with open(args.input, "rb") as rf, open(args.output, "wb") as wf:
+        # 入力は mmap してページキャッシュから直接切り出す（mmap できなければ自前でまとめ読み）
+        # 出力も --io-buffer 単位でまとめて書くので、同じ大きさのバッファを持たせる（既定サイズ未満にはしない）
+        out_buffering = max(args.io_buffer, io.DEFAULT_BUFFER_SIZE)
+        with open(args.input, "rb", buffering=0) as rf, \
+                open(args.output, "wb", buffering=out_buffering) as wf:
+            try:
+                mm = mmap.mmap(rf.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                mm = None
+            if mm is not None and hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                # 先頭から順に舐めるだけなので先読みを促す
+                mm.madvise(mmap.MADV_SEQUENTIAL)
             # ヘッダ行の出力（オプション）: 使用する struct (sd) のフィールド名を sep で結合
             if args.header_structs:
                 field_names = [name for name, _ in sd.fields]
@@ -308,58 +856,26 @@ def main():
                 header_bytes = sep_bytes.join(name.encode(
                     "utf-8") for name in field_names) + out_term_bytes
                 wf.write(header_bytes)
-            row_no = 0
-            while True:
-                # フィールド部を固定長で読む
-                block = rf.read(total_field_len)
-                if not block:
-                    break
-                if len(block) < total_field_len:
-                    print(
-                        f"[WARN] 末尾不完全: 残り {len(block)} バイト（期待 {total_field_len}）を破棄します。", file=sys.stderr)
-                    warnings += 1
-                    break
-
-                # 入力終端の検証（長さ0ならスキップ）
-                if in_term_len > 0:
-                    tail = rf.read(in_term_len)
-                    if len(tail) < in_term_len:
-                        msg = f"[ERR] 末尾不完全: 入力終端が読めません（行 {row_no+1} 期待 {in_term_len}B）"
-                        if args.lenient:
-                            print(msg, file=sys.stderr)
-                            warnings += 1
-                            tail = in_term_bytes  # ダミー扱い
-                        else:
-                            print(msg, file=sys.stderr)
-                            sys.exit(2)
-
-                    if tail != in_term_bytes:
-                        msg = (f"[ERR] 入力終端不一致（行 {row_no+1} ）: "
-                               f"got={tail!r} expected={in_term_bytes!r}")
-                        if args.lenient:
-                            print(msg, file=sys.stderr)
-                            warnings += 1
-                            # 続行（出力は指定の out-term で正規化）
-                        else:
-                            print(msg, file=sys.stderr)
-                            sys.exit(2)
-
-                row_no += 1
-
-                # フィールドを切出し → 必要ならエスケープ → 任意区切りで連結 → 出力行末(out-term)
-                pos = 0
-                out_fields = []
-                for name, ln in sd.fields:
-                    seg = block[pos:pos+ln]
-                    pos += ln
-                    out_fields.append(escape_bytes(
-                        seg, args.escape, args.prefix))
-
-                wf.write(sep_bytes.join(out_fields) + out_term_bytes)
-
-                processed += 1
-                if rows_limit is not None and processed >= rows_limit:
-                    break
+            try:
+                if jobs > 1 and mm is not None:
+                    processed, warnings = convert_records_parallel(
+                        args.input, args.output, wf, sd, in_term_bytes, out_term_bytes, sep_bytes,
+                        escape=args.escape, prefix=args.prefix,
+                        rows_limit=rows_limit, lenient=args.lenient,
+                        chunk_size=args.io_buffer, max_warnings=args.max_warnings, jobs=jobs)
+                else:
+                    processed, warnings = convert_records(
+                        mm if mm is not None else rf, wf, sd, in_term_bytes, out_term_bytes, sep_bytes,
+                        escape=args.escape, prefix=args.prefix,
+                        rows_limit=rows_limit, lenient=args.lenient,
+                        chunk_size=args.io_buffer, max_warnings=args.max_warnings,
+                        src_fd=rf.fileno() if mm is not None else None)
+            finally:
+                if mm is not None:
+                    mm.close()
+    except RecordFormatError as e:
+        print(f"[ERR] {e}", file=sys.stderr)
+        sys.exit(2)
     except Exception as e:
         print(f"[ERROR] 変換中に例外が発生しました: {e}", file=sys.stderr)
         sys.exit(2)
@@ -5,8 +5,8 @@
 """
 
 import re
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
 
 # 構造体内の BYTE 宣言:  BYTE Name[len];
 BYTE_DECL_RE = re.compile(
@@ -14,57 +14,143 @@ BYTE_DECL_RE = re.compile(
     re.ASCII
 )
 
+# コメント除去で次に注目する位置:  // 行末コメント / ブロックコメント開始 / 文字列開始
+COMMENT_START_RE = re.compile(r'//|/\*|"')
+# 行末コメントの終わり（str.splitlines が改行とみなす文字）
+LINE_END_RE = re.compile(r"[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+
 # 複数struct抽出: struct <Name?> { ... } <ext list>?;
 #   - Name は必須とする（無名は1定義のみの時だけ許容）
 #   - 後続の拡張子列は省略可（その場合は自動選択不可。--struct が必要）
-STRUCT_BLOCK_RE = re.compile(
-    r"""
-    struct
-    \s+([A-Za-z_]\w*)                      # 1: name
-    \s*\{(.*?)\}                           # 2: body (non-greedy)
-    \s*([^;{}]*)?;?                        # 3: trailing ext list (optional, up to ';')
-    """,
-    re.IGNORECASE | re.DOTALL | re.VERBOSE
-)
+# 本文を丸ごと正規表現で拾うとバックトラックが起きうるため、
+# キーワード → 見出し → 閉じカッコ → 拡張子列 の順に前から 1 回だけ走査する。
+STRUCT_KEYWORD_RE = re.compile(r"struct", re.IGNORECASE)
+# キーワード直後の見出し:  <空白> Name {  または  {（無名）
+STRUCT_HEAD_RE = re.compile(r"(?:\s+([A-Za-z_]\w*))?\s*\{", re.IGNORECASE)
+# 閉じカッコ後の拡張子列（';' まで。'{' / '}' が来たらそこで打ち切り）
+STRUCT_TRAILER_RE = re.compile(r"\s*([^;{}]*);?")
 
 
-@dataclass
+@dataclass(slots=True)
 class StructDef:
-    """構造体定義"""
+    """構造体定義（__slots__ 付き: インスタンスに __dict__ を持たない）"""
     name: str
     fields: List[Tuple[str, int]]
     exts: List[str]  # lowercased, without leading dot
 
+    # 以下は fields から導出（定義時に一度だけ計算）
+    total_len: int = field(init=False, repr=False, compare=False)      # フィールド長の合計
+    # 全フィールドを一度に切り出す struct のフォーマット（例: "5s3s"）
+    record_format: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.total_len = sum(ln for _, ln in self.fields)
+        self.record_format = "".join(f"{ln}s" for _, ln in self.fields)
+
 
 def strip_block_and_line_comments(text: str) -> str:
-    """/* ... */ を先に除去し、その後で // 行末コメントを除去。"""
-    # ブロックコメント
-    text = re.sub(r"/\*.*?\*/", "", text, flags=re.DOTALL)
-    # 行末 // コメント
-    lines = []
-    for raw in text.splitlines():
-        s = raw.split("//", 1)[0]
-        lines.append(s)
-    return "\n".join(lines)
+    """
+    /* ... */ と // 行末コメントを除去。
+
+    前から 1 回だけ走査し、次の '//' '/*' '"' へ飛びながら読むので、入力長に比例した時間で終わる
+    （閉じていない '/*' が大量にあってもバックトラックしない）。
+      - 先に現れた方が優先（C と同じく、// コメント内の /* や /* */ 内の // は無視）
+      - 同じ行で閉じている "..." の中の // や /* はコメントとみなさない
+      - 閉じていない /* はコメントとみなさず、そのまま残す
+      - 改行は \n に揃える
+    """
+    out = []
+    pos = 0
+    # 直近の '*/' 検索結果（block_end_from 以降で最初の '*/' の位置。-1 なら以降に無い）
+    block_end_from, block_end = -1, -1
+    while True:
+        m = COMMENT_START_RE.search(text, pos)
+        if m is None:
+            out.append(text[pos:])
+            break
+        start = m.start()
+        token = m.group()
+        if token == "//":
+            out.append(text[pos:start])
+            eol = LINE_END_RE.search(text, start)
+            if eol is None:
+                break
+            pos = eol.start()  # 改行自体は残す
+        elif token == "/*":
+            # 前回の '*/' 検索結果がまだ有効なら使い回す（閉じていない '/*' が続いても
+            # 毎回末尾まで探し直さない）
+            if block_end_from < 0 or (block_end >= 0 and block_end < start + 2):
+                block_end_from, block_end = start + 2, text.find("*/", start + 2)
+            end = block_end
+            if end < 0:
+                # 閉じていないのでコメントではない
+                out.append(text[pos:start + 2])
+                pos = start + 2
+                continue
+            out.append(text[pos:start])
+            pos = end + 2
+        else:
+            # 文字列は同じ行の中で閉じている場合だけ、そのまま読み飛ばす
+            close = text.find('"', start + 1)
+            if close < 0 or LINE_END_RE.search(text, start + 1, close):
+                close = start
+            out.append(text[pos:close + 1])
+            pos = close + 1
+    return "\n".join("".join(out).splitlines())
 
 
 def parse_ext_list(exts_raw: Optional[str]) -> List[str]:
     """カンマ区切りの拡張子列を正規化して返す（小文字、先頭ドットは除去）。"""
     if not exts_raw:
         return []
-    norm = []
-    for tok in exts_raw.split(","):
-        t = tok.strip()
-        if not t:
+    # 小文字化は全体に 1 回だけ。各要素から 前後の空白 → 先頭ドット1つ → 末尾セミコロン等 を除く
+    return [t for t in (tok.strip().removeprefix(".").strip(" ;\t\r\n")
+                        for tok in exts_raw.lower().split(",")) if t]
+
+
+def iter_struct_blocks(text: str) -> Iterator[Tuple[Optional[str], int, int, str]]:
+    """
+    コメント除去済みの設定文字列から struct ブロックを前から順に取り出す。
+    (name, body_start, body_end, ext_raw) を返す。本文は text[body_start:body_end]。無名structは name=None。
+
+    - 本文は '{' の後の最初の '}' まで（入れ子は非対応）
+    - 名前付きブロックは末尾の ';' まで読み進めて次を探す
+    - 無名ブロックは名前付きが1つも無い場合の後方互換用なので、読み進めずに次の 'struct' を探す
+    """
+    pos = 0
+    while True:
+        kw = STRUCT_KEYWORD_RE.search(text, pos)
+        if kw is None:
+            return
+        head = STRUCT_HEAD_RE.match(text, kw.end())
+        if head is None:
+            pos = kw.start() + 1
             continue
-        if t.startswith("."):
-            t = t[1:]
-        t = t.lower()
-        # スペース混入や末尾セミコロンを取り除く
-        t = t.strip(" ;\t\r\n")
-        if t:
-            norm.append(t)
-    return norm
+        close = text.find("}", head.end())
+        if close < 0:
+            # 以降に '}' が無いので、後続の struct も閉じられない
+            return
+        name = head.group(1)
+        trailer = STRUCT_TRAILER_RE.match(text, close + 1)
+        yield name, head.end(), close, trailer.group(1)
+        pos = trailer.end() if name else kw.start() + 1
+
+
+def parse_fields(text: str, owner: str, pos: int = 0, endpos: Optional[int] = None) -> List[Tuple[str, int]]:
+    """
+    struct 本文 text[pos:endpos] から BYTE Name[len]; を (name, len) の配列として取り出す。
+    （本文を切り出さずに元の文字列の範囲を直接走査する）
+    """
+    if endpos is None:
+        endpos = len(text)
+    fields: List[Tuple[str, int]] = []
+    for mm in BYTE_DECL_RE.finditer(text, pos, endpos):
+        fname = mm.group(1)
+        flen = int(mm.group(2))
+        if flen <= 0:
+            raise ValueError(f"フィールド長が不正です: {owner}.{fname} = {flen}")
+        fields.append((fname, flen))
+    return fields
 
 
 def parse_structs_config(text: str) -> List[StructDef]:
@@ -76,49 +162,29 @@ def parse_structs_config(text: str) -> List[StructDef]:
     """
     cleaned = strip_block_and_line_comments(text)
     structs: List[StructDef] = []
+    anon = None
 
-    for m in STRUCT_BLOCK_RE.finditer(cleaned):
-        name = m.group(1)
-        body = m.group(2) or ""
-        ext_raw = m.group(3) or ""
-
-        fields: List[Tuple[str, int]] = []
-        for mm in BYTE_DECL_RE.finditer(body):
-            fname = mm.group(1)
-            flen = int(mm.group(2))
-            if flen <= 0:
-                raise ValueError(f"フィールド長が不正です: {name}.{fname} = {flen}")
-            fields.append((fname, flen))
-
+    for name, body_start, body_end, ext_raw in iter_struct_blocks(cleaned):
+        if name is None:
+            if anon is None:
+                anon = (body_start, body_end, ext_raw)
+            continue
+        fields = parse_fields(cleaned, name, body_start, body_end)
         if not fields:
             raise ValueError(f"struct '{name}' に BYTE フィールドが見つかりません。")
-
-        exts = parse_ext_list(ext_raw)
-        structs.append(StructDef(name=name, fields=fields, exts=exts))
+        structs.append(StructDef(name=name, fields=fields, exts=parse_ext_list(ext_raw)))
 
     if not structs:
         # 無名structの簡易対応（後方互換：単一定義のみ許可）
         # 例: struct { BYTE A[1]; } txt;
         # → 非推奨。必要ならここを強化可。
-        anon = re.search(
-            r"struct\s*\{(.*?)\}\s*([^;{}]*)?;?", cleaned, flags=re.DOTALL | re.IGNORECASE)
-        if anon:
-            body = anon.group(1) or ""
-            ext_raw = anon.group(2) or ""
-            fields = []
-            for mm in BYTE_DECL_RE.finditer(body):
-                fname = mm.group(1)
-                flen = int(mm.group(2))
-                if flen <= 0:
-                    raise ValueError(
-                        f"フィールド長が不正です: <anonymous>.{fname} = {flen}")
-                fields.append((fname, flen))
-            if not fields:
-                raise ValueError("無名structに BYTE フィールドが見つかりません。")
-            exts = parse_ext_list(ext_raw)
-            structs.append(StructDef(name="_anonymous_",
-                           fields=fields, exts=exts))
-        else:
+        if anon is None:
             raise ValueError("struct 定義が見つかりません。")
+        body_start, body_end, ext_raw = anon
+        fields = parse_fields(cleaned, "<anonymous>", body_start, body_end)
+        if not fields:
+            raise ValueError("無名structに BYTE フィールドが見つかりません。")
+        structs.append(StructDef(name="_anonymous_",
+                       fields=fields, exts=parse_ext_list(ext_raw)))
 
     return structs
@@ -15,9 +15,19 @@ from fixedrec.cli import (
     parse_term,
     escape_bytes,
     choose_struct,
+    load_structs_cached,
+    convert_records,
+    build_block_converter,
+    RecordFormatError,
 )
+from fixedrec import cli
+import contextlib
+import io
+import shutil
+import struct
 import sys
 import unittest
+from unittest import mock
 import tempfile
 import os
 from pathlib import Path
@@ -70,6 +80,24 @@ class TestStripComments(unittest.TestCase):
         self.assertNotIn("/*", result)
         self.assertNotIn("//", result)
 
+    def test_first_comment_wins(self):
+        """先に現れたコメントが優先（// の中の /* はブロックコメントを始めない）"""
+        text = "BYTE A[1]; // old /* note\nBYTE B[2]; /* // x */ BYTE C[3];"
+        self.assertEqual(strip_block_and_line_comments(text),
+                         "BYTE A[1]; \nBYTE B[2];  BYTE C[3];")
+
+    def test_comment_markers_in_string(self):
+        """同じ行で閉じた文字列の中の // や /* はそのまま残す"""
+        text = 'struct A { BYTE X[1]; } "a//b", "/*c*/"; // tail\n"open // x'
+        self.assertEqual(strip_block_and_line_comments(text),
+                         'struct A { BYTE X[1]; } "a//b", "/*c*/"; \n"open ')
+
+    def test_unclosed_block_comment_is_linear(self):
+        """閉じていない /* は残し、大量にあっても線形時間で終わる"""
+        self.assertEqual(strip_block_and_line_comments("A /* B"), "A /* B")
+        text = "/* " * 200000
+        self.assertEqual(strip_block_and_line_comments(text), text)
+
 
 class TestParseExtList(unittest.TestCase):
     """拡張子リスト解析のテスト"""
@@ -192,6 +220,22 @@ class TestParseStructsConfig(unittest.TestCase):
             parse_structs_config(text)
         self.assertIn("BYTE フィールドが見つかりません", str(cm.exception))
 
+    def test_unclosed_struct_is_linear(self):
+        """閉じカッコの無い struct が大量にあっても即座にエラーになる"""
+        with self.assertRaises(ValueError) as cm:
+            parse_structs_config("struct A {" * 20000)
+        self.assertIn("struct 定義が見つかりません", str(cm.exception))
+
+    def test_named_struct_preferred_over_anonymous(self):
+        """名前付き struct がある場合、無名 struct は無視される"""
+        text = """
+        struct { BYTE X[1]; } dat;
+        STRUCT Named { BYTE A[2]; } txt;
+        """
+        result = parse_structs_config(text)
+        self.assertEqual([sd.name for sd in result], ["Named"])
+        self.assertEqual(result[0].fields, [("A", 2)])
+
     def test_anonymous_struct(self):
         """無名struct（後方互換）"""
         text = """
@@ -204,6 +248,33 @@ class TestParseStructsConfig(unittest.TestCase):
         self.assertEqual(result[0].name, "_anonymous_")
 
 
+class TestStructDef(unittest.TestCase):
+    """StructDef の導出値のテスト"""
+
+    def test_derived_layout(self):
+        """合計長・struct フォーマットを定義時に計算する"""
+        sd = StructDef(name="T", fields=[("A", 5), ("B", 3)], exts=["txt"])
+        self.assertEqual(sd.total_len, 8)
+        self.assertEqual(sd.record_format, "5s3s")
+        self.assertEqual(struct.unpack_from(sd.record_format, b"--AAAAABBB", 2), (b"AAAAA", b"BBB"))
+
+    def test_slots(self):
+        """__slots__ を使い、インスタンスごとの __dict__ を持たない"""
+        sd = StructDef(name="T", fields=[("A", 5)], exts=[])
+        self.assertFalse(hasattr(sd, "__dict__"))
+        with self.assertRaises(AttributeError):
+            sd.unknown = 1
+
+    def test_pickle_roundtrip(self):
+        """pickle で保存/復元しても同じ（--jobs のワーカーへそのまま渡す）"""
+        import pickle
+        sd = StructDef(name="T", fields=[("A", 5), ("B", 3)], exts=["txt"])
+        restored = pickle.loads(pickle.dumps(sd))
+        self.assertEqual(restored, sd)
+        self.assertEqual(restored.total_len, 8)
+        self.assertEqual(restored.record_format, "5s3s")
+
+
 class TestParseBytesFromArg(unittest.TestCase):
     """バイト列解析のテスト"""
 
@@ -240,6 +311,26 @@ class TestParseBytesFromArg(unittest.TestCase):
         expected = "テスト".encode("utf-8")
         self.assertEqual(result, expected)
 
+    def test_escape_with_non_ascii(self):
+        """エスケープと非ASCII文字の混在（非ASCII部分は化けずに UTF-8 になる）"""
+        self.assertEqual(parse_bytes_from_arg("テスト\\t"), "テスト\t".encode("utf-8"))
+        self.assertEqual(parse_bytes_from_arg("é\\x1f"), "é\x1f".encode("utf-8"))
+        self.assertEqual(parse_bytes_from_arg("\\u00e9"), "é".encode("utf-8"))
+        self.assertEqual(parse_bytes_from_arg("\\xff"), "\xff".encode("utf-8"))
+        # 不正なエスケープの直後の非ASCII文字も書かれたまま残る
+        self.assertEqual(parse_bytes_from_arg("\\€"), "\\€".encode("utf-8"))
+        self.assertEqual(parse_bytes_from_arg("\\テ"), "\\テ".encode("utf-8"))
+        self.assertEqual(parse_bytes_from_arg("\\\\テ\\t"), "\\テ\t".encode("utf-8"))
+
+    def test_cached(self):
+        """hex:/エスケープ/通常文字列とも 2 回目はキャッシュから返す"""
+        parse_bytes_from_arg.cache_clear()
+        for arg in ["hex:09", "\\t", ","]:
+            first = parse_bytes_from_arg(arg)
+            self.assertIs(parse_bytes_from_arg(arg), first)
+        self.assertEqual(parse_bytes_from_arg.cache_info().hits, 3)
+        self.assertEqual(parse_bytes_from_arg.cache_info().maxsize, 128)
+
 
 class TestParseTerm(unittest.TestCase):
     """終端記号解析のテスト"""
@@ -272,6 +363,16 @@ class TestParseTerm(unittest.TestCase):
         result = parse_term("hex:1f")
         self.assertEqual(result, b"\x1f")
 
+    def test_cached(self):
+        """同じ引数は 2 回目以降キャッシュから返す（エラーはキャッシュしない）"""
+        parse_term.cache_clear()
+        first = parse_term("\\x1e")
+        self.assertIs(parse_term("\\x1e"), first)
+        self.assertEqual(parse_term.cache_info().hits, 1)
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                parse_term("hex:1")
+
 
 class TestEscapeBytes(unittest.TestCase):
     """バイトエスケープのテスト"""
@@ -281,6 +382,8 @@ class TestEscapeBytes(unittest.TestCase):
         data = b"\x00\x1f\x20\x7e\x7f"
         result = escape_bytes(data, "none")
         self.assertEqual(result, data)
+        # コピーせずそのまま返す
+        self.assertIs(result, data)
 
     def test_hex_mode_printable(self):
         """hex モード（可視文字）"""
@@ -306,6 +409,29 @@ class TestEscapeBytes(unittest.TestCase):
         result = escape_bytes(data, "hex", prefix="%")
         self.assertEqual(result, b"%00%1f")
 
+    def test_hex_mode_multichar_prefix(self):
+        """hex モード（複数文字の接頭辞）"""
+        data = b"\x00\x1f"
+        result = escape_bytes(data, "hex", prefix="\\x")
+        self.assertEqual(result, b"\\x00\\x1f")
+
+    def test_hex_mode_empty(self):
+        """hex モード（空バイト列）"""
+        self.assertEqual(escape_bytes(b"", "hex"), b"")
+        self.assertEqual(escape_bytes(b"", "hex", prefix="%"), b"")
+        self.assertEqual(escape_bytes(b"", "hex", prefix="\\x"), b"")
+
+    def test_hex_mode_all_bytes(self):
+        """hex モード（全バイト値・接頭辞ごとの変換関数は使い回す）"""
+        data = bytes(range(256))
+        for prefix in ["", "%", "\\x", "0x"]:
+            sep = " " if prefix == "" else ""
+            expected = sep.join(f"{prefix}{b:02x}" for b in data).encode("ascii")
+            self.assertEqual(escape_bytes(data, "hex", prefix=prefix), expected)
+            self.assertIs(cli.hex_escaper(prefix), cli.hex_escaper(prefix))
+        # 利用者が与える接頭辞ごとに増えるので、キャッシュは上限付き
+        self.assertEqual(cli.hex_escaper.cache_info().maxsize, 128)
+
     def test_invalid_mode(self):
         """不正なモード"""
         with self.assertRaises(ValueError):
@@ -342,6 +468,15 @@ class TestChooseStruct(unittest.TestCase):
         result = choose_struct(self.structs, None, "test.dat")
         self.assertEqual(result.name, "Dat")
 
+    def test_auto_select_extension_edge_cases(self):
+        """拡張子の取り出し（ディレクトリ名のドット・大文字・多重拡張子・先頭ドット）"""
+        self.assertEqual(choose_struct(self.structs, None, "dir.dat/test.TXT").name, "Txt")
+        self.assertEqual(choose_struct(self.structs, None, "archive.txt.bin").name, "Dat")
+        single = [self.structs[0]]
+        # 先頭のドットは拡張子の区切りではない（".dat" は拡張子なし扱い）
+        self.assertEqual(choose_struct(single, None, "dir/.dat").name, "Txt")
+        self.assertEqual(choose_struct(single, None, "test.").name, "Txt")
+
     def test_auto_select_no_extension(self):
         """拡張子なし（単一struct時）"""
         single = [self.structs[0]]
@@ -371,6 +506,319 @@ class TestChooseStruct(unittest.TestCase):
         result = choose_struct(self.structs, None, "test.TXT")
         self.assertEqual(result.name, "Txt")
 
+    def test_multiple_matches(self):
+        """同じ拡張子を持つ struct が複数あればエラー（1 つの struct 内の重複は 1 回と数える）"""
+        structs = self.structs + [StructDef(name="Dat2", fields=[("D", 1)], exts=["dat", "dat"])]
+        self.assertEqual(choose_struct(structs, None, "b.BIN").name, "Dat")
+        with self.assertRaises(ValueError) as cm:
+            choose_struct(structs, None, "d.dat")
+        self.assertIn("複数の struct がマッチしました: Dat, Dat2", str(cm.exception))
+
+
+class TestLoadStructsCached(unittest.TestCase):
+    """設定ファイル解析結果キャッシュのテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, True)
+        env = mock.patch.dict(os.environ, {"XDG_CACHE_HOME": os.path.join(self.temp_dir, "cache")})
+        env.start()
+        self.addCleanup(env.stop)
+        self.config_path = os.path.join(self.temp_dir, "layout.struct")
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            f.write("struct Cached { BYTE A[2]; } txt;")
+
+    def test_second_load_uses_cache(self):
+        """2回目以降は解析せずキャッシュから返す"""
+        first = load_structs_cached(self.config_path)
+        self.assertEqual(first[0].name, "Cached")
+        self.assertEqual(len(os.listdir(cli.config_cache_dir())), 1)
+        with mock.patch.object(cli, "parse_structs_config") as parse:
+            second = load_structs_cached(self.config_path)
+        parse.assert_not_called()
+        self.assertEqual(second, first)
+
+    def test_modified_config_is_reparsed(self):
+        """設定ファイルが変わったら再解析する"""
+        load_structs_cached(self.config_path)
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            f.write("struct Changed { BYTE A[2]; BYTE B[3]; } txt;")
+        result = load_structs_cached(self.config_path)
+        self.assertEqual(result[0].name, "Changed")
+
+    def test_cache_is_plain_json(self):
+        """キャッシュは (name, fields, exts) だけを JSON で保存する"""
+        import json
+        load_structs_cached(self.config_path)
+        cache_dir = cli.config_cache_dir()
+        (name,) = os.listdir(cache_dir)
+        self.assertTrue(name.endswith(".json"))
+        with open(os.path.join(cache_dir, name), encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["structs"], [["Cached", [["A", 2]], ["txt"]]])
+
+    def test_parser_change_invalidates_cache(self):
+        """パーサーが変わったら（指紋が変わったら）再解析する"""
+        load_structs_cached(self.config_path)
+        with mock.patch.object(cli, "parser_fingerprint", return_value="changed"), \
+                mock.patch.object(cli, "parse_structs_config",
+                                  wraps=cli.parse_structs_config) as parse:
+            load_structs_cached(self.config_path)
+        parse.assert_called_once()
+
+    def test_broken_cache_is_ignored(self):
+        """壊れたキャッシュは無視して解析し直す"""
+        load_structs_cached(self.config_path)
+        cache_dir = cli.config_cache_dir()
+        (name,) = os.listdir(cache_dir)
+        with open(os.path.join(cache_dir, name), "w", encoding="utf-8") as f:
+            f.write("{")
+        self.assertEqual(load_structs_cached(self.config_path)[0].name, "Cached")
+
+    def test_cache_disabled(self):
+        """use_cache=False ではキャッシュを作らない"""
+        load_structs_cached(self.config_path, use_cache=False)
+        self.assertFalse(os.path.exists(cli.config_cache_dir()))
+
+
+class TestBuildBlockConverter(unittest.TestCase):
+    """複数レコード一括変換のテスト"""
+
+    def test_convert_block(self):
+        """各レコードを区切り/行末付きで出力する"""
+        convert = build_block_converter(
+            StructDef(name="T", fields=[("A", 2), ("B", 3)], exts=[]), 1, b" | ", b"\r\n")
+        out = bytearray(b"H\n")
+        convert(b"--AABBB\nCCDDD\nEEFFF\n", 2, 2, out)
+        self.assertEqual(out, b"H\nAA | BBB\r\nCC | DDD\r\n")
+
+    def test_convert_block_hex(self):
+        """hex エスケープ（接頭辞なし/1文字/複数文字）も escape_bytes と同じ結果になる"""
+        data = b"\x00\x1f\\A\x7f\xff\r\n" * 3
+        sd = StructDef(name="T", fields=[("A", 2), ("B", 1), ("C", 3)], exts=[])
+        for prefix in ["", "%", "\\x"]:
+            convert = build_block_converter(sd, 2, b",", b"\n", "hex", prefix)
+            out = bytearray()
+            convert(data, 0, 3, out)
+            row = b",".join(escape_bytes(seg, "hex", prefix)
+                            for seg in (b"\x00\x1f", b"\\", b"A\x7f\xff"))
+            self.assertEqual(out, (row + b"\n") * 3, prefix)
+
+    def test_convert_block_single_field_no_term(self):
+        """フィールド1つ・入出力終端なし"""
+        convert = build_block_converter(
+            StructDef(name="T", fields=[("A", 3)], exts=[]), 0, b",", b"")
+        out = bytearray()
+        convert(b"abcdefghi", 0, 3, out)
+        self.assertEqual(out, b"abcdefghi")
+
+    def test_convert_block_copy_through(self):
+        """区切りが現れず入出力終端が同じなら入力をそのまま出力する"""
+        data = b"--AABBB\r\nCCDDD\r\n"
+        for fields, sep in [([("A", 5)], b","), ([("A", 2), ("B", 3)], b"")]:
+            sd = StructDef(name="T", fields=fields, exts=[])
+            convert = build_block_converter(sd, 2, sep, b"\r\n", in_term_bytes=b"\r\n")
+            out = bytearray()
+            convert(data, 2, 2, out)
+            self.assertEqual(out, b"AABBB\r\nCCDDD\r\n")
+
+
+class TestConvertRecords(unittest.TestCase):
+    """レコード変換本体のテスト（メモリ上のストリームで実行）"""
+
+    def setUp(self):
+        self.sd = StructDef(name="T", fields=[("A", 2), ("B", 3)], exts=[])
+
+    def _convert(self, data, **kwargs):
+        wf = io.BytesIO()
+        params = dict(in_term_bytes=b"\r\n", out_term_bytes=b"\n", sep_bytes=b",")
+        params.update(kwargs)
+        processed, warnings = convert_records(io.BytesIO(data), wf, self.sd, **params)
+        return processed, warnings, wf.getvalue()
+
+    def test_records_across_chunks(self):
+        """チャンク境界をまたいでも全レコードを変換できる"""
+        data = b"".join(b"%02d" % i + b"xyz" + b"\r\n" for i in range(10))
+        # 1チャンク = 2レコード分になるよう小さくする
+        with mock.patch.object(cli, "IO_CHUNK_SIZE", 14):
+            processed, warnings, out = self._convert(data)
+        self.assertEqual(processed, 10)
+        self.assertEqual(warnings, 0)
+        self.assertEqual(out, b"".join(b"%02d,xyz\n" % i for i in range(10)))
+
+    def test_output_written_in_batches(self):
+        """出力は 1 つの bytearray に溜めて chunk_size ごとにまとめて書く（レコード単位では書かない）"""
+        data = b"".join(b"%02d" % (i % 100) + b"xyz" + b"\r\n" for i in range(1000))
+        writes = []  # 書いた後にバッファは使い回されるので、その時点の中身を控える
+        wf = mock.Mock()
+        wf.write.side_effect = lambda b: writes.append(bytes(b))
+        processed, warnings = convert_records(data, wf, self.sd, b"\r\n", b"\n", b",",
+                                              chunk_size=700)
+        self.assertEqual(processed, 1000)
+        self.assertEqual(b"".join(writes), b"".join(b"%02d,xyz\n" % (i % 100) for i in range(1000)))
+        # 出力 7000 バイト / 700 バイトごと → 10 回前後
+        self.assertLessEqual(len(writes), 11)
+
+    def test_buffer_input(self):
+        """bytes 等のバッファを直接渡しても同じ結果になる"""
+        data = b"".join(b"%02d" % i + b"xyz" + b"\r\n" for i in range(10)) + b"ZZ"
+        with mock.patch.object(cli, "IO_CHUNK_SIZE", 14):
+            expected = self._convert(data)
+            wf = io.BytesIO()
+            processed, warnings = convert_records(
+                data, wf, self.sd, b"\r\n", b"\n", b",")
+        self.assertEqual((processed, warnings, wf.getvalue()), expected)
+
+    def test_rows_limit(self):
+        """rows_limit で打ち切る"""
+        data = (b"AABBB\r\n" * 5) + b"X"
+        processed, warnings, out = self._convert(data, rows_limit=2)
+        self.assertEqual(processed, 2)
+        self.assertEqual(warnings, 0)
+        self.assertEqual(out, b"AA,BBB\n" * 2)
+
+    def test_trailing_partial_record_is_discarded(self):
+        """末尾の不完全レコードは警告して破棄"""
+        processed, warnings, out = self._convert(b"AABBB\r\nCC")
+        self.assertEqual(processed, 1)
+        self.assertEqual(warnings, 1)
+        self.assertEqual(out, b"AA,BBB\n")
+
+    def test_term_mismatch_strict(self):
+        """厳密モードでは終端不一致で例外（それまでの行は出力済み）"""
+        wf = io.BytesIO()
+        with self.assertRaises(RecordFormatError) as cm:
+            convert_records(io.BytesIO(b"AABBB\r\nCCDDD\n\n"), wf, self.sd,
+                            b"\r\n", b"\n", b",")
+        self.assertIn("行 2", str(cm.exception))
+        self.assertEqual(wf.getvalue(), b"AA,BBB\n")
+
+    def test_single_byte_term_mismatch(self):
+        """1 バイト終端の不一致行を特定できる"""
+        processed, warnings, out = self._convert(
+            b"AABBB\nCCDDD|EEFFF\n", in_term_bytes=b"\n", lenient=True)
+        self.assertEqual(processed, 3)
+        self.assertEqual(warnings, 1)
+        self.assertEqual(out, b"AA,BBB\nCC,DDD\nEE,FFF\n")
+        with self.assertRaises(RecordFormatError) as cm:
+            self._convert(b"AABBB\nCCDDD|EEFFF\n", in_term_bytes=b"\n")
+        self.assertIn("行 2", str(cm.exception))
+        self.assertIn("got=b'|'", str(cm.exception))
+
+    def test_term_mismatch_lenient(self):
+        """lenient では終端不一致/欠落を警告して継続"""
+        processed, warnings, out = self._convert(
+            b"AABBB\n\nCCDDD\r", lenient=True)
+        self.assertEqual(processed, 2)
+        self.assertEqual(warnings, 2)
+        self.assertEqual(out, b"AA,BBB\nCC,DDD\n")
+
+    def test_passthrough_lenient_normalizes_term(self):
+        """入力そのままを出力できる構成でも、不一致の終端は出力終端に置き換える"""
+        self.sd = StructDef(name="T", fields=[("A", 5)], exts=[])
+        processed, warnings, out = self._convert(
+            b"AABBB\nCCDDD|EEFFF\n", in_term_bytes=b"\n", out_term_bytes=b"\n", lenient=True)
+        self.assertEqual((processed, warnings), (3, 1))
+        self.assertEqual(out, b"AABBB\nCCDDD\nEEFFF\n")
+
+    def test_passthrough_kernel_copy(self):
+        """ファイル→ファイルで入力そのままの場合は copy_file_range を使う（失敗時は通常コピー）"""
+        import mmap
+        self.sd = StructDef(name="T", fields=[("A", 5)], exts=[])
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        in_path = os.path.join(temp_dir, "in.dat")
+        data = b"".join(b"%05d\r\n" % i for i in range(100)) + b"XY"
+        with open(in_path, "wb") as f:
+            f.write(data)
+
+        def run(copy_file_range=None):
+            out_path = os.path.join(temp_dir, "out.txt")
+            patch = (mock.patch.object(os, "copy_file_range", copy_file_range)
+                     if copy_file_range else contextlib.nullcontext())
+            with open(in_path, "rb") as rf, open(out_path, "wb") as wf, \
+                    mmap.mmap(rf.fileno(), 0, access=mmap.ACCESS_READ) as mm, patch:
+                wf.write(b"H\r\n")
+                result = convert_records(mm, wf, self.sd, b"\r\n", b"\r\n", b",",
+                                         chunk_size=70, rows_limit=99, src_fd=rf.fileno())
+            with open(out_path, "rb") as f:
+                return result, f.read()
+
+        expected = ((99, 0), b"H\r\n" + data[:99 * 7])
+        if hasattr(os, "copy_file_range"):
+            spy = mock.Mock(wraps=os.copy_file_range)
+            self.assertEqual(run(copy_file_range=spy), expected)
+            self.assertTrue(spy.called)
+            broken = mock.Mock(side_effect=OSError("EXDEV"))
+            self.assertEqual(run(copy_file_range=broken), expected)
+            self.assertEqual(broken.call_count, 1)
+        self.assertEqual(run(), expected)
+
+    def test_byte_range(self):
+        """byte_range で範囲を絞っても行番号は入力先頭から数える"""
+        data = b"AABBB\r\nCCDDD\r\nEEFFF\n\nGGHHH\r\n"
+        wf = io.BytesIO()
+        with self.assertRaises(RecordFormatError) as cm:
+            convert_records(data, wf, self.sd, b"\r\n", b"\n", b",", byte_range=(7, 28))
+        self.assertIn("行 3", str(cm.exception))
+        self.assertEqual(wf.getvalue(), b"CC,DDD\n")
+
+    def test_parallel_matches_sequential(self):
+        """並列変換は逐次変換と同じ出力・警告・エラーになる"""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        in_path = os.path.join(temp_dir, "in.dat")
+        out_path = os.path.join(temp_dir, "out.txt")
+        records = [b"%05d\r\n" % i for i in range(30)]
+        for i in (4, 17, 18, 25):
+            records[i] = records[i][:5] + b"\n!"
+        with open(in_path, "wb") as f:
+            f.write(b"".join(records) + b"ABCDE\r")
+
+        def run(parallel, **kwargs):
+            params = dict(in_term_bytes=b"\r\n", out_term_bytes=b"\n", sep_bytes=b",",
+                          chunk_size=14, max_warnings=3)
+            params.update(kwargs)
+            err = io.StringIO()
+            with open(out_path, "wb") as wf, mock.patch("sys.stderr", err):
+                try:
+                    if parallel:
+                        result = cli.convert_records_parallel(
+                            in_path, out_path, wf, self.sd, jobs=3, **params)
+                    else:
+                        with open(in_path, "rb") as rf:
+                            result = convert_records(rf, wf, self.sd, **params)
+                except RecordFormatError as e:
+                    result = str(e)
+            with open(out_path, "rb") as f:
+                return result, f.read(), err.getvalue()
+
+        # 同じディレクトリにある利用者のファイルは上書きも削除もしない
+        user_part = out_path + ".part0"
+        with open(user_part, "wb") as f:
+            f.write(b"keep")
+
+        for kwargs in [dict(lenient=True), dict(lenient=True, max_warnings=0),
+                       dict(lenient=True, rows_limit=20), dict()]:
+            with self.subTest(**kwargs):
+                expected = run(False, **kwargs)
+                self.assertEqual(run(True, **kwargs), expected)
+        self.assertEqual(sorted(os.listdir(temp_dir)), ["in.dat", "out.txt", "out.txt.part0"])
+        with open(user_part, "rb") as f:
+            self.assertEqual(f.read(), b"keep")
+
+    def test_max_warnings(self):
+        """警告の表示は max_warnings 件までで、件数はすべて数える"""
+        data = b"AABBB|" * 5
+        err = io.StringIO()
+        with mock.patch("sys.stderr", err):
+            processed, warnings, out = self._convert(
+                data, in_term_bytes=b"\n", lenient=True, max_warnings=2)
+        self.assertEqual(processed, 5)
+        self.assertEqual(warnings, 5)
+        lines = err.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertIn("3 件の表示を省略", lines[-1])
+
 
 class TestIntegration(unittest.TestCase):
     """統合テスト（実際のファイル入出力）"""
@@ -379,6 +827,10 @@ class TestIntegration(unittest.TestCase):
         """テンポラリディレクトリを準備"""
         self.temp_dir = tempfile.mkdtemp()
         self.addCleanup(lambda: self._cleanup_temp_dir())
+        # 子プロセスが設定キャッシュを作ってもホームディレクトリを汚さないようにする
+        env = mock.patch.dict(os.environ, {"XDG_CACHE_HOME": os.path.join(self.temp_dir, "cache")})
+        env.start()
+        self.addCleanup(env.stop)
 
     def _cleanup_temp_dir(self):
         """テンポラリディレクトリのクリーンアップ"""
@@ -472,6 +924,156 @@ class TestIntegration(unittest.TestCase):
         # エスケープされているはず（デフォルト prefix 無し → スペース区切りの2桁HEX）
         self.assertIn(b"00 1f", output)
 
+    def test_config_cache_is_opt_in(self):
+        """設定キャッシュは --config-cache 指定時だけ作る"""
+        config_path = os.path.join(self.temp_dir, "layout.struct")
+        with open(config_path, "w", encoding="utf-8") as f:
+            f.write("struct Test { BYTE A[2]; } txt;")
+        input_path = os.path.join(self.temp_dir, "input.txt")
+        with open(input_path, "wb") as f:
+            f.write(b"AA\r\n")
+        output_path = os.path.join(self.temp_dir, "output.txt")
+        cache_dir = os.path.join(self.temp_dir, "cache", "fixedrec")
+
+        import subprocess
+        base_args = [sys.executable, "-m", "fixedrec",
+                     "-i", input_path, "-o", output_path, "-c", config_path]
+        result = subprocess.run(base_args, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, f"stderr: {result.stderr}")
+        self.assertFalse(os.path.exists(cache_dir))
+
+        result = subprocess.run(base_args + ["--config-cache"], capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, f"stderr: {result.stderr}")
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+    def test_prefix_ignored_without_hex_escape(self):
+        """--escape none なら非ASCIIの --prefix は無視して変換する"""
+        config_path = os.path.join(self.temp_dir, "layout.struct")
+        with open(config_path, "w", encoding="utf-8") as f:
+            f.write("struct Test { BYTE A[2]; BYTE B[3]; } txt;")
+        input_path = os.path.join(self.temp_dir, "input.txt")
+        with open(input_path, "wb") as f:
+            f.write(b"AABBB\r\nCCDDD\r\n")
+        output_path = os.path.join(self.temp_dir, "output.txt")
+
+        import subprocess
+        result = subprocess.run(
+            [sys.executable, "-m", "fixedrec",
+             "-i", input_path,
+             "-o", output_path,
+             "-c", config_path,
+             "--escape", "none",
+             "--prefix", "\u00a5"],
+            capture_output=True,
+            text=True
+        )
+        self.assertEqual(result.returncode, 0, f"stderr: {result.stderr}")
+        with open(output_path, "rb") as f:
+            self.assertEqual(f.read(), b"AA\tBBB\r\nCC\tDDD\r\n")
+
+    def test_import_defers_optional_modules(self):
+        """fixedrec.cli の import だけでは特定の経路でしか使わないモジュールを読み込まない"""
+        import subprocess
+        deferred = ["argparse", "concurrent.futures", "hashlib", "json", "pickle", "shutil", "tempfile"]
+        result = subprocess.run(
+            [sys.executable, "-c",
+             "import sys, fixedrec.cli; "
+             f"print([m for m in {deferred!r} if m in sys.modules])"],
+            capture_output=True,
+            text=True
+        )
+        self.assertEqual(result.returncode, 0, f"stderr: {result.stderr}")
+        self.assertEqual(result.stdout.strip(), "[]")
+
+    def test_package_exposes_submodules(self):
+        """import fixedrec だけで fixedrec.cli / fixedrec.parser を参照できる（import は参照時）"""
+        import subprocess
+        result = subprocess.run(
+            [sys.executable, "-c",
+             "import sys, fixedrec; "
+             "before = 'fixedrec.cli' in sys.modules or 'fixedrec.parser' in sys.modules; "
+             "print(before, callable(fixedrec.cli.main), fixedrec.parser.StructDef.__name__, "
+             "fixedrec.StructDef is fixedrec.parser.StructDef, 'cli' in dir(fixedrec))"],
+            capture_output=True,
+            text=True
+        )
+        self.assertEqual(result.returncode, 0, f"stderr: {result.stderr}")
+        self.assertEqual(result.stdout.split(), ["False", "True", "StructDef", "True", "True"])
+
+    def test_small_io_buffer(self):
+        """--io-buffer を小さくしても結果は変わらない"""
+        config_path = os.path.join(self.temp_dir, "layout.struct")
+        with open(config_path, "w", encoding="utf-8") as f:
+            f.write("struct Test { BYTE A[2]; BYTE B[3]; } txt;")
+
+        input_path = os.path.join(self.temp_dir, "input.txt")
+        with open(input_path, "wb") as f:
+            for i in range(20):
+                f.write(b"%02d" % i + b"xyz" + b"\r\n")
+        output_path = os.path.join(self.temp_dir, "output.txt")
+
+        import subprocess
+        result = subprocess.run(
+            [sys.executable, "-m", "fixedrec",
+             "-i", input_path,
+             "-o", output_path,
+             "-c", config_path,
+             "--io-buffer", "10"],
+            capture_output=True,
+            text=True
+        )
+        self.assertEqual(result.returncode, 0, f"stderr: {result.stderr}")
+
+        with open(output_path, "rb") as f:
+            output = f.read()
+        self.assertEqual(output, b"".join(b"%02d\txyz\r\n" % i for i in range(20)))
+
+    def test_negative_max_warnings_rejected(self):
+        """--max-warnings に負の値を与えると引数エラー（終了コード 2）"""
+        config_path = os.path.join(self.temp_dir, "layout.struct")
+        with open(config_path, "w", encoding="utf-8") as f:
+            f.write("struct Test { BYTE A[2]; } txt;")
+        input_path = os.path.join(self.temp_dir, "input.txt")
+        with open(input_path, "wb") as f:
+            f.write(b"AA\r\n")
+
+        import subprocess
+        result = subprocess.run(
+            [sys.executable, "-m", "fixedrec",
+             "-i", input_path,
+             "-o", os.path.join(self.temp_dir, "output.txt"),
+             "-c", config_path,
+             "--max-warnings", "-5"],
+            capture_output=True,
+            text=True
+        )
+        self.assertEqual(result.returncode, 2)
+        self.assertIn("--max-warnings", result.stderr)
+
+    def test_invalid_numeric_options_rejected_with_dump_layout(self):
+        """--dump-layout でも --jobs/--io-buffer/--max-warnings の不正値は引数エラー（終了コード 2）"""
+        config_path = os.path.join(self.temp_dir, "layout.struct")
+        with open(config_path, "w", encoding="utf-8") as f:
+            f.write("struct Test { BYTE A[2]; } txt;")
+        input_path = os.path.join(self.temp_dir, "input.txt")
+        with open(input_path, "wb") as f:
+            f.write(b"AA\r\n")
+
+        import subprocess
+        for option, value in [("--jobs", "-3"), ("--io-buffer", "0"), ("--max-warnings", "-1")]:
+            with self.subTest(option=option):
+                result = subprocess.run(
+                    [sys.executable, "-m", "fixedrec",
+                     "-i", input_path,
+                     "-o", os.path.join(self.temp_dir, "output.txt"),
+                     "-c", config_path,
+                     "--dump-layout", option, value],
+                    capture_output=True,
+                    text=True
+                )
+                self.assertEqual(result.returncode, 2)
+                self.assertIn(option, result.stderr)
+
     def test_header_structs_outputs_field_names(self):
         """--header-structs オプションでヘッダにフィールド名が出ることを確認"""
         # 設定ファイル作成